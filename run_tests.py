@@ -5,6 +5,8 @@
 #     "pyyaml>=6.0",
 #     "rich>=13.0",
 #     "nibabel>=5.0",
+#     "orjson>=3.9",
+#     "pyahocorasick>=2.0",
 # ]
 # ///
 """
@@ -23,23 +25,49 @@ Test files are loaded from tests/ directory. Tests run in work/ directory.
 """
 
 import argparse
+import atexit
+import fnmatch
+import functools
 import json
+import multiprocessing
 import os
-import random
+import queue
 import re
+import shlex
 import shutil
 import subprocess
 import sys
 import tempfile
 import threading
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
-from multiprocessing import Manager, Queue
+from datetime import datetime
+from multiprocessing import shared_memory
 from pathlib import Path
 from typing import Any
 
+import orjson
 import yaml
+
+try:
+    import nibabel as nib
+except ImportError:
+    # Only needed for same_dimensions validations; fail those clearly instead
+    nib = None
+
+try:
+    import ahocorasick
+except ImportError:
+    # Optional: expected-output checks fall back to a regex-union scan
+    ahocorasick = None
+
+try:
+    # libyaml C loader: several times faster than the pure-Python parser
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 from rich.console import Console
 from rich.progress import (
     BarColumn,
@@ -57,7 +85,7 @@ from rich import box
 console = Console()
 
 
-@dataclass
+@dataclass(slots=True)
 class TestResult:
     """Result of a single test execution."""
     name: str
@@ -70,7 +98,7 @@ class TestResult:
     exit_code: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class TestSuiteResult:
     """Result of a test suite (YAML file) execution."""
     name: str
@@ -83,7 +111,7 @@ class TestSuiteResult:
     results: list[TestResult] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class PreparedTest:
     """A test prepared for execution with all context."""
     suite_name: str
@@ -96,23 +124,86 @@ class PreparedTest:
     default_timeout: int
     script_runner: str | None = None
     script_ext: str = ".sh"
+    # Pre-substituted at preparation time so the per-test hot path skips the
+    # regex pass. None means "resolve at run time" (e.g. script: tests).
+    command_resolved: str | None = None
+    env_setup_resolved: str | None = None
+    validations_resolved: list[tuple[str, Any]] | None = None
+    binds: list[str] | None = None
+
+
+# Parsed YAML configs keyed by (path, mtime); avoids re-parsing the same
+# test file across the preparation helpers within one run.
+_YAML_CACHE: dict[tuple[str, int], dict] = {}
+
+
+def _load_yaml_cached(yaml_path: Path) -> dict:
+    """Load a YAML test file, reusing the parsed dict if unchanged on disk."""
+    key = (str(yaml_path), yaml_path.stat().st_mtime_ns)
+    config = _YAML_CACHE.get(key)
+    if config is None:
+        with open(yaml_path) as f:
+            config = yaml.load(f, Loader=_YamlLoader)
+        _YAML_CACHE[key] = config
+    return config
+
+
+def _load_duration_history(jsonl_path: Path) -> dict[tuple[str, str], float]:
+    """Load per-test durations from a previous run's JSONL output."""
+    history: dict[tuple[str, str], float] = {}
+    try:
+        with open(jsonl_path) as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "suite" in rec and "test" in rec and "duration" in rec:
+                    history[(rec["suite"], rec["test"])] = float(rec["duration"])
+    except OSError:
+        pass
+    return history
+
+
+@functools.lru_cache(maxsize=4)
+def _container_listing(containers_dir: Path) -> tuple[frozenset, dict[str, str]]:
+    """One scan of containers_dir: all file names plus newest .simg per base."""
+    names = set()
+    newest: dict[str, str] = {}
+    try:
+        with os.scandir(containers_dir) as it:
+            for entry in it:
+                names.add(entry.name)
+                if entry.name.endswith(".simg") and "_" in entry.name:
+                    base = entry.name.split("_")[0]
+                    prev = newest.get(base)
+                    if prev is None or entry.name > prev:
+                        newest[base] = entry.name
+    except OSError:
+        pass
+    return frozenset(names), newest
 
 
 def find_container(container_pattern: str, containers_dir: Path) -> Path | None:
-    """Find container file matching pattern."""
-    if containers_dir.exists():
-        # Try exact match first
-        exact = containers_dir / container_pattern
-        if exact.exists():
-            return exact
+    """Find container file matching pattern.
+
+    Every suite resolves against the same directory, so the listing is
+    scanned once and lookups become dict hits rather than globs.
+    """
+    names, newest = _container_listing(containers_dir)
 
-        # Try glob pattern
-        base_name = container_pattern.replace(".simg", "").split("_")[0]
-        matches = list(containers_dir.glob(f"{base_name}_*.simg"))
-        if matches:
-            return sorted(matches)[-1]  # Return newest version
+    # Try exact match first
+    if container_pattern in names:
+        return containers_dir / container_pattern
 
-    return None
+    # Fall back to the newest versioned image for the base name
+    base_name = container_pattern.replace(".simg", "").split("_")[0]
+    name = newest.get(base_name)
+    return containers_dir / name if name else None
+
+
+# Matches ${var} or $var in one pass; unknown variables are left as-is.
+_VAR_RE = re.compile(r"\$\{(\w+)\}|\$(\w+)")
 
 
 def substitute_variables(text: str, variables: dict[str, str]) -> str:
@@ -120,12 +211,71 @@ def substitute_variables(text: str, variables: dict[str, str]) -> str:
     if not text:
         return text
 
-    result = text
-    for key, value in variables.items():
-        result = result.replace(f"${{{key}}}", str(value))
-        result = result.replace(f"${key}", str(value))
+    return _VAR_RE.sub(
+        lambda m: str(variables.get(m.group(1) or m.group(2), m.group(0))),
+        text,
+    )
 
-    return result
+
+def _resolve_validations(
+    validations: list, variables: dict[str, str]
+) -> list[tuple[str, Any]]:
+    """Normalize validation entries and pre-substitute their path arguments."""
+    resolved: list[tuple[str, Any]] = []
+    for validation in validations:
+        if not isinstance(validation, dict):
+            continue
+        for val_type, val_arg in validation.items():
+            if val_type == "output_exists":
+                resolved.append(
+                    (val_type, substitute_variables(str(val_arg), variables))
+                )
+            elif val_type == "same_dimensions":
+                if isinstance(val_arg, list) and len(val_arg) == 2:
+                    resolved.append((val_type, (
+                        substitute_variables(str(val_arg[0]), variables),
+                        substitute_variables(str(val_arg[1]), variables),
+                    )))
+    return resolved
+
+
+def _scan_file_for(f, patterns: list[str]) -> set[str]:
+    """Stream an open binary file and return which substrings appear in it.
+
+    Reads 1 MiB chunks with just enough overlap to catch matches spanning
+    a boundary, so memory stays bounded regardless of output size. Uses an
+    Aho-Corasick automaton when pyahocorasick is installed and the pattern
+    count justifies the build cost, otherwise a plain scan per pattern.
+    """
+    pending = {p for p in patterns if p}
+    found: set[str] = set()
+    if not pending:
+        return found
+
+    automaton = None
+    if ahocorasick is not None and len(pending) >= 4:
+        automaton = ahocorasick.Automaton()
+        for p in pending:
+            automaton.add_word(p, p)
+        automaton.make_automaton()
+
+    overlap = max(len(p.encode("utf-8")) for p in pending) - 1
+    f.seek(0)
+    carry = b""
+    while pending:
+        data = f.read(1 << 20)
+        if not data:
+            break
+        window = carry + data
+        text = window.decode("utf-8", "replace")
+        if automaton is not None:
+            hits = {v for _, v in automaton.iter(text)} & pending
+        else:
+            hits = {p for p in pending if p in text}
+        found |= hits
+        pending -= hits
+        carry = window[-overlap:] if overlap > 0 else b""
+    return found
 
 
 def check_file_exists(path: str) -> bool:
@@ -133,16 +283,29 @@ def check_file_exists(path: str) -> bool:
     return Path(path).exists()
 
 
+# NIfTI shapes keyed by (path, mtime): reference images get compared against
+# many outputs across a suite, and only the header is needed for the shape.
+@functools.lru_cache(maxsize=512)
+def _nifti_shape_cached(path: str, mtime_ns: int, size: int) -> tuple:
+    """Parse a NIfTI header for its shape; cached on the file's identity."""
+    # header access never touches the (lazily loaded) data blocks
+    return tuple(nib.load(path).header.get_data_shape())
+
+
+def _nifti_shape(path: str) -> tuple:
+    """Read a NIfTI image's shape, reparsing only when the file changes."""
+    st = os.stat(path)
+    return _nifti_shape_cached(path, st.st_mtime_ns, st.st_size)
+
+
 def check_same_dimensions(path1: str, path2: str) -> tuple[bool, str]:
     """Check if two NIfTI files have same dimensions."""
-    try:
-        import nibabel as nib
-
-        img1 = nib.load(path1)
-        img2 = nib.load(path2)
+    if nib is None:
+        return False, "Error comparing dimensions: nibabel is not installed"
 
-        shape1 = img1.shape
-        shape2 = img2.shape
+    try:
+        shape1 = _nifti_shape(path1)
+        shape2 = _nifti_shape(path2)
 
         if shape1 == shape2:
             return True, f"Dimensions match: {shape1}"
@@ -152,6 +315,206 @@ def check_same_dimensions(path1: str, path2: str) -> tuple[bool, str]:
         return False, f"Error comparing dimensions: {e}"
 
 
+# Long-lived apptainer instances keyed by (container path, bind set):
+# started lazily in each worker process and reused so the SIF image is
+# mounted once per worker instead of once per test. Stopped at exit.
+_INSTANCES: dict[tuple[str, tuple[str, ...]], str | None] = {}
+
+# Guards the instance table: in thread mode two workers can race the
+# lookup during a multi-second instance start and leak the loser's
+# instance; starts are serialized instead.
+_INSTANCES_LOCK = threading.Lock()
+
+# Cap on warm instances per process: a full sweep touches ~100 containers
+# and each live instance holds a mounted SIF plus a tmpfs, so the table is
+# kept LRU with the evicted instance stopped. Chunks group tests by
+# container, so a small working set covers the reuse that matters.
+_MAX_INSTANCES = 4
+
+
+def _stop_instances() -> None:
+    with _INSTANCES_LOCK:
+        for instance_name in _INSTANCES.values():
+            if instance_name:
+                subprocess.run(
+                    ["apptainer", "instance", "stop", instance_name],
+                    capture_output=True,
+                )
+        _INSTANCES.clear()
+
+
+_instance_seq = 0
+
+
+def _get_instance(container_path: Path, binds: list[str]) -> str | None:
+    """Start (or reuse) an apptainer instance for this container and bind set.
+
+    Returns the instance name, or None if startup failed; callers fall back
+    to a plain per-test `apptainer exec <image>`. At most _MAX_INSTANCES
+    stay warm per process; the least recently used one is stopped to make
+    room.
+    """
+    global _instance_seq
+    key = (str(container_path), tuple(binds))
+    with _INSTANCES_LOCK:
+        if key in _INSTANCES:
+            # Refresh LRU position (dicts keep insertion order)
+            name = _INSTANCES.pop(key)
+            _INSTANCES[key] = name
+            return name
+
+        if not _INSTANCES:
+            atexit.register(_stop_instances)
+
+        while len(_INSTANCES) >= _MAX_INSTANCES:
+            oldest = next(iter(_INSTANCES))
+            evicted = _INSTANCES.pop(oldest)
+            if evicted:
+                subprocess.run(
+                    ["apptainer", "instance", "stop", evicted],
+                    capture_output=True,
+                )
+
+        _instance_seq += 1
+        instance_name = f"nct_{os.getpid()}_{_instance_seq}"
+        cmd_list = ["apptainer", "instance", "start", "--writable-tmpfs"]
+        for b in binds:
+            cmd_list.extend(["-B", b])
+        cmd_list.extend([str(container_path), instance_name])
+        try:
+            result = subprocess.run(cmd_list, capture_output=True, timeout=120)
+            name = instance_name if result.returncode == 0 else None
+        except (OSError, subprocess.TimeoutExpired):
+            name = None
+        _INSTANCES[key] = name
+        return name
+
+
+def _compute_binds(work_dir: Path, variables: dict[str, str]) -> list[str]:
+    """Bind-mount specs for apptainer: the work dir plus existing variable parents."""
+    binds = {f"{work_dir}:{work_dir}"}
+    for key, value in variables.items():
+        if key not in ["output_dir"] and "/" in str(value):
+            parent = Path(value).parent
+            if parent.exists():
+                binds.add(f"{parent}:{parent}")
+    return sorted(binds)
+
+
+# Per-stream capture cap: keep this many bytes of head and of tail, drop
+# the middle. Long neuroimaging runs can emit MBs of log we never show.
+_MAX_CAPTURE_BYTES = 64 * 1024
+
+# Effective cap for the current run; overridable with --max-output-bytes
+# and per test with max_output_bytes in the YAML.
+_capture_limit: int = _MAX_CAPTURE_BYTES
+
+# Whether JSONL records keep stdout/stderr for passing tests. On by
+# default because the analysis workflow reads passing output to spot
+# false positives; --jsonl-compact opts out for smaller files.
+_keep_passing_output: bool = True
+
+# Bash builtins and keywords with no standalone binary (or different
+# semantics as one); commands starting with these must run under bash.
+_SHELL_BUILTINS = frozenset({
+    "command", "source", ".", "cd", "export", "eval", "exec", "builtin",
+    "declare", "local", "readonly", "set", "unset", "shopt", "alias",
+    "unalias", "type", "hash", "time", "ulimit", "umask", "trap", "wait",
+    "read", "if", "while", "for", "until", "case", "select", "function",
+    "[[", "test", "[", "!",
+})
+
+# Pre-built Rich status tags; assembled once instead of per result line.
+_PASS_TAG = "[green]PASS[/]"
+_FAIL_TAG = "[red]FAIL[/]"
+
+
+def _read_head_tail(f, limit: int) -> str:
+    """Read head+tail of an open binary file without loading the middle."""
+    size = f.seek(0, os.SEEK_END)
+    if size <= 2 * limit:
+        f.seek(0)
+        return f.read().decode("utf-8", "replace")
+    f.seek(0)
+    head = f.read(limit).decode("utf-8", "replace")
+    f.seek(-limit, os.SEEK_END)
+    tail = f.read(limit).decode("utf-8", "replace")
+    return f"{head}\n...[{size - 2 * limit} bytes truncated]...\n{tail}"
+
+
+def _run_script_capped(
+    cmd_list: list[str],
+    script_text: str,
+    timeout: float,
+    cwd: Path,
+    limit: int | None = None,
+    scan_patterns: list[str] | None = None,
+) -> tuple[str, str, int, set[str]]:
+    """Run a command feeding script_text on stdin, capping captured output.
+
+    Output streams are redirected to unlinked temp files, so the kernel
+    moves the bytes and Python never buffers more than head+tail of each
+    stream — chatty tests can't blow up worker RSS. Small outputs never
+    leave the page cache. scan_patterns are matched against the *full*
+    streams before truncation, so expected-output checks keep the same
+    verdict as an uncapped capture; the returned set holds the patterns
+    found. Raises subprocess.TimeoutExpired like subprocess.run, with the
+    partial (capped) output attached.
+    """
+    if limit is None:
+        limit = _capture_limit
+    with tempfile.TemporaryFile() as out_f, tempfile.TemporaryFile() as err_f:
+        proc = subprocess.Popen(
+            cmd_list,
+            stdin=subprocess.PIPE,
+            stdout=out_f,
+            stderr=err_f,
+            cwd=cwd,
+        )
+
+        # Feed stdin from a thread so the timeout still fires even if the
+        # child never reads its script.
+        def _feed():
+            try:
+                proc.stdin.write(script_text.encode())
+            except (BrokenPipeError, OSError):
+                pass
+            finally:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+
+        threading.Thread(target=_feed, daemon=True).start()
+
+        try:
+            exit_code = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            exc = subprocess.TimeoutExpired(cmd_list, timeout)
+            exc.output = _read_head_tail(out_f, limit)
+            exc.stderr = _read_head_tail(err_f, limit)
+            raise exc from None
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+
+        found: set[str] = set()
+        if scan_patterns:
+            found = _scan_file_for(out_f, scan_patterns)
+            if len(found) < len(set(p for p in scan_patterns if p)):
+                found |= _scan_file_for(err_f, [p for p in scan_patterns if p not in found])
+
+        return (
+            _read_head_tail(out_f, limit),
+            _read_head_tail(err_f, limit),
+            exit_code,
+            found,
+        )
+
+
 def run_single_test(
     test: dict,
     container_path: Path,
@@ -161,10 +524,12 @@ def run_single_test(
     default_timeout: int = 120,
     script_runner: str | None = None,
     script_ext: str = ".sh",
+    command_resolved: str | None = None,
+    env_setup_resolved: str | None = None,
+    validations_resolved: list[tuple[str, Any]] | None = None,
+    binds: list[str] | None = None,
 ) -> TestResult:
     """Run a single test and return result."""
-    from datetime import datetime
-
     name = test.get("name", "Unnamed test")
     start_timestamp = datetime.now().isoformat()
     start_time = time.time()
@@ -204,65 +569,78 @@ def run_single_test(
             else:
                 # Default: run as bash script
                 command = str(extra_script_path)
+        elif command_resolved is not None:
+            command = command_resolved
         else:
             command = substitute_variables(command, variables)
 
         # Build environment setup
-        env_setup = test.get("env_setup", global_env_setup) or ""
+        if env_setup_resolved is not None:
+            env_setup = env_setup_resolved
+        else:
+            env_setup = test.get("env_setup", global_env_setup) or ""
+            if env_setup:
+                env_setup = substitute_variables(env_setup, variables)
+
+        # Feed the command script to bash over stdin (bash -s): avoids all
+        # shell quoting issues like a temp file would, without the
+        # open/chmod/unlink syscalls per test on the shared work dir.
+        # Commands with no env setup and no shell syntax skip the wrapper
+        # entirely and go straight to the exec as argv, saving a bash fork.
+        first_token = command.split(None, 1)[0] if command.strip() else ""
+        needs_shell = (
+            bool(env_setup)
+            or extra_script_path is not None
+            or "=" in first_token  # leading VAR=value assignment words
+            or first_token in _SHELL_BUILTINS
+            or any(c in command for c in "|&;()<>*?$`\"'\\\n[]{}~#")
+        )
+        script_text = "#!/usr/bin/env bash\n"
         if env_setup:
-            env_setup = substitute_variables(env_setup, variables)
-
-        # Write command to temporary script file (avoids all shell quoting issues)
-        script_path = work_dir / f".test_{os.getpid()}_{int(time.time()*1e6)}.sh"
-        try:
-            with open(script_path, 'w') as f:
-                f.write("#!/usr/bin/env bash\n")
-                if env_setup:
-                    f.write(f"{env_setup}\n")
-                f.write(f"{command}\n")
-            os.chmod(script_path, 0o755)
-        except OSError as e:
-            return TestResult(
-                name=name, passed=False, duration=time.time() - start_time,
-                start_time=start_timestamp, message=f"Failed to create test script: {e}",
-            )
+            script_text += f"{env_setup}\n"
+        script_text += f"{command}\n"
 
         try:
             if container_path:
-                binds = set()
-                binds.add(f"{work_dir}:{work_dir}")
-                for key, value in variables.items():
-                    if key not in ["output_dir"] and "/" in str(value):
-                        parent = Path(value).parent
-                        if parent.exists():
-                            binds.add(f"{parent}:{parent}")
-
-                cmd_list = ["apptainer", "exec", "--writable-tmpfs"]
-                for b in binds:
-                    cmd_list.extend(["-B", b])
-                cmd_list.extend([str(container_path), "bash", str(script_path)])
+                if binds is None:
+                    binds = _compute_binds(work_dir, variables)
+
+                # Exec against a warm instance when one can be started;
+                # mounting the SIF per test dominates short test runtimes.
+                instance_name = _get_instance(container_path, binds)
+                if instance_name:
+                    cmd_list = [
+                        "apptainer", "exec", f"instance://{instance_name}",
+                    ]
+                else:
+                    cmd_list = ["apptainer", "exec", "--writable-tmpfs"]
+                    for b in binds:
+                        cmd_list.extend(["-B", b])
+                    cmd_list.append(str(container_path))
+            else:
+                cmd_list = []
+            if needs_shell:
+                cmd_list.extend(["bash", "-s"])
             else:
-                cmd_list = ["bash", str(script_path)]
+                cmd_list.extend(shlex.split(command))
+                script_text = ""
 
             timeout = test.get("timeout", default_timeout)
 
-            result = subprocess.run(
-                cmd_list,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                cwd=work_dir,
+            expected_output = test.get("expected_output_contains")
+            if isinstance(expected_output, str):
+                expected_list = [expected_output]
+            else:
+                expected_list = expected_output or []
+
+            stdout, stderr, exit_code, expected_found = _run_script_capped(
+                cmd_list, script_text, timeout, work_dir,
+                limit=int(test.get("max_output_bytes", _capture_limit)),
+                scan_patterns=expected_list,
             )
 
             duration = time.time() - start_time
-            stdout = result.stdout
-            stderr = result.stderr
-            exit_code = result.returncode
         finally:
-            try:
-                script_path.unlink(missing_ok=True)
-            except OSError:
-                pass
             if extra_script_path:
                 try:
                     extra_script_path.unlink(missing_ok=True)
@@ -298,64 +676,57 @@ def run_single_test(
                 exit_code=exit_code,
             )
 
-        # Check expected output
-        expected_output = test.get("expected_output_contains")
-        if expected_output:
-            combined_output = stdout + stderr
-
-            if isinstance(expected_output, str):
-                expected_list = [expected_output]
-            else:
-                expected_list = expected_output
+        # Check expected output (matched against the full streams, not the
+        # capped capture)
+        if expected_list:
+            missing = next(
+                (e for e in expected_list if e and e not in expected_found), None
+            )
+            if missing is not None:
+                return TestResult(
+                    name=name,
+                    passed=False,
+                    duration=duration,
+                    start_time=start_timestamp,
+                    message=f"Expected output not found: '{missing[:50]}...'",
+                    stdout=stdout,
+                    stderr=stderr,
+                    exit_code=exit_code,
+                )
 
-            for expected in expected_list:
-                if expected and expected not in combined_output:
+        # Run validations
+        if validations_resolved is None:
+            validations_resolved = _resolve_validations(
+                test.get("validate", []), variables
+            )
+        for val_type, val_arg in validations_resolved:
+            if val_type == "output_exists":
+                if not check_file_exists(val_arg):
                     return TestResult(
                         name=name,
                         passed=False,
                         duration=duration,
                         start_time=start_timestamp,
-                        message=f"Expected output not found: '{expected[:50]}...'",
+                        message=f"Output file not found: {val_arg}",
                         stdout=stdout,
                         stderr=stderr,
                         exit_code=exit_code,
                     )
 
-        # Run validations
-        validations = test.get("validate", [])
-        for validation in validations:
-            if isinstance(validation, dict):
-                for val_type, val_arg in validation.items():
-                    if val_type == "output_exists":
-                        path = substitute_variables(str(val_arg), variables)
-                        if not check_file_exists(path):
-                            return TestResult(
-                                name=name,
-                                passed=False,
-                                duration=duration,
-                                start_time=start_timestamp,
-                                message=f"Output file not found: {path}",
-                                stdout=stdout,
-                                stderr=stderr,
-                                exit_code=exit_code,
-                            )
-
-                    elif val_type == "same_dimensions":
-                        if isinstance(val_arg, list) and len(val_arg) == 2:
-                            path1 = substitute_variables(str(val_arg[0]), variables)
-                            path2 = substitute_variables(str(val_arg[1]), variables)
-                            ok, msg = check_same_dimensions(path1, path2)
-                            if not ok:
-                                return TestResult(
-                                    name=name,
-                                    passed=False,
-                                    duration=duration,
-                                    start_time=start_timestamp,
-                                    message=msg,
-                                    stdout=stdout,
-                                    stderr=stderr,
-                                    exit_code=exit_code,
-                                )
+            elif val_type == "same_dimensions":
+                path1, path2 = val_arg
+                ok, msg = check_same_dimensions(path1, path2)
+                if not ok:
+                    return TestResult(
+                        name=name,
+                        passed=False,
+                        duration=duration,
+                        start_time=start_timestamp,
+                        message=msg,
+                        stdout=stdout,
+                        stderr=stderr,
+                        exit_code=exit_code,
+                    )
 
         return TestResult(
             name=name,
@@ -368,13 +739,15 @@ def run_single_test(
             exit_code=exit_code,
         )
 
-    except subprocess.TimeoutExpired:
+    except subprocess.TimeoutExpired as e:
         return TestResult(
             name=name,
             passed=False,
             duration=time.time() - start_time,
             start_time=start_timestamp,
             message=f"Timeout after {test.get('timeout', default_timeout)}s",
+            stdout=e.output or "",
+            stderr=e.stderr or "",
         )
     except Exception as e:
         return TestResult(
@@ -390,8 +763,6 @@ def _run_container_health_check(
     container_path: Path, work_dir: Path, variables: dict[str, str]
 ) -> TestResult:
     """Quick check that the container can execute a basic command."""
-    from datetime import datetime
-
     start = time.time()
 
     binds = set()
@@ -435,22 +806,36 @@ def _run_container_health_check(
         )
 
 
+# Health-check results keyed by (container path, mtime): suites sharing an
+# image skip the redundant apptainer spawn during preparation.
+_HEALTH_CACHE: dict[tuple[str, int], TestResult] = {}
+
+
+def _container_health_cached(
+    container_path: Path, work_dir: Path, variables: dict[str, str]
+) -> TestResult:
+    """Run the container health check, reusing the result for an unchanged image."""
+    key = (str(container_path), container_path.stat().st_mtime_ns)
+    result = _HEALTH_CACHE.get(key)
+    if result is None:
+        result = _run_container_health_check(container_path, work_dir, variables)
+        _HEALTH_CACHE[key] = result
+    return result
+
+
 def run_test_suite(
     yaml_path: Path,
     containers_dir: Path,
     work_dir: Path,
-    test_filter: str | None = None,
+    filter_re: re.Pattern | None = None,
     verbose: bool = False,
     on_test_complete: Any = None,
-    result_queue: Any = None,
-    running_tests: Any = None,
 ) -> TestSuiteResult:
-    """Run all tests in a YAML file."""
+    """Run all tests in a YAML file sequentially (the -j 1 path)."""
     start_time = time.time()
 
     # Load YAML
-    with open(yaml_path) as f:
-        config = yaml.safe_load(f)
+    config = _load_yaml_cached(yaml_path)
 
     suite_name = config.get("name", yaml_path.stem)
     container_name = config.get("container", "")
@@ -545,13 +930,12 @@ def run_test_suite(
             )
 
     # Container health check
-    health_result = _run_container_health_check(container_path, work_dir, variables)
+    health_result = _container_health_cached(container_path, work_dir, variables)
     if not health_result.passed:
         # Get and filter tests to know how many to skip
         tests = config.get("tests", [])
-        if test_filter:
-            pattern = re.compile(test_filter, re.IGNORECASE)
-            tests = [t for t in tests if pattern.search(t.get("name", ""))]
+        if filter_re:
+            tests = [t for t in tests if filter_re.search(t.get("name", ""))]
 
         skip_results = [health_result]
         for test in tests:
@@ -564,23 +948,10 @@ def run_test_suite(
             )
             skip_results.append(skip_result)
 
-        # Report results via callback/queue so they appear in JSONL output
+        # Report results via callback so they appear in JSONL output
         for r in skip_results:
             if on_test_complete is not None:
                 on_test_complete(suite_name, container_name, r)
-            if result_queue is not None:
-                result_queue.put({
-                    "suite": suite_name,
-                    "container": container_name,
-                    "test": r.name,
-                    "passed": r.passed,
-                    "start_time": r.start_time,
-                    "duration": r.duration,
-                    "message": r.message,
-                    "exit_code": r.exit_code,
-                    "stdout": r.stdout,
-                    "stderr": r.stderr,
-                })
 
         return TestSuiteResult(
             name=suite_name,
@@ -592,20 +963,16 @@ def run_test_suite(
 
     # Get and filter tests
     tests = config.get("tests", [])
-    if test_filter:
-        pattern = re.compile(test_filter, re.IGNORECASE)
-        tests = [t for t in tests if pattern.search(t.get("name", ""))]
+    if filter_re:
+        tests = [t for t in tests if filter_re.search(t.get("name", ""))]
+
+    # Bind mounts depend only on the variables, so stat the paths once for
+    # the whole suite rather than per test.
+    binds = _compute_binds(work_dir, variables)
 
     # Run tests
     results = []
     for test in tests:
-        test_name = test.get("name", "Unnamed test")
-        test_key = f"{suite_name}: {test_name}"
-
-        # Track running test
-        if running_tests is not None:
-            running_tests[test_key] = True
-
         result = run_single_test(
             test=test,
             container_path=container_path,
@@ -615,34 +982,16 @@ def run_test_suite(
             default_timeout=default_timeout,
             script_runner=script_runner,
             script_ext=script_ext,
+            binds=binds,
         )
         results.append(result)
 
-        # Remove from running tests
-        if running_tests is not None:
-            running_tests.pop(test_key, None)
-
-        # Call callback immediately after each test (for sequential mode)
+        # Call callback immediately after each test
         if on_test_complete is not None:
             on_test_complete(suite_name, container_name, result)
 
-        # Put result on queue (for parallel mode)
-        if result_queue is not None:
-            result_queue.put({
-                "suite": suite_name,
-                "container": container_name,
-                "test": result.name,
-                "passed": result.passed,
-                "start_time": result.start_time,
-                "duration": result.duration,
-                "message": result.message,
-                "exit_code": result.exit_code,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-            })
-
         if verbose:
-            status = "[green]PASS[/]" if result.passed else "[red]FAIL[/]"
+            status = _PASS_TAG if result.passed else _FAIL_TAG
             console.print(f"  {status} {result.name} ({result.duration:.2f}s)")
             if not result.passed:
                 console.print(f"    [dim]{result.message}[/]")
@@ -677,27 +1026,51 @@ def run_test_suite(
     )
 
 
-def run_test_suite_wrapper(args: tuple) -> TestSuiteResult:
-    """Wrapper for parallel execution."""
-    yaml_path, containers_dir, work_dir, test_filter, verbose, result_queue, running_tests = args
-    return run_test_suite(
-        yaml_path, containers_dir, work_dir, test_filter, verbose,
-        on_test_complete=None, result_queue=result_queue, running_tests=running_tests
-    )
+def run_prepared_chunk(chunk: list[PreparedTest]) -> int:
+    """Run a chunk of prepared tests, streaming each result to the parent.
+
+    Returns the number of results put on the queue so the parent knows
+    when it has drained everything.
+    """
+    count = 0
+    for prepared in chunk:
+        suite, container, result = run_prepared_test_wrapper(prepared)
+        if result.passed and not _keep_passing_output:
+            # --jsonl-compact: nothing reads passing output, so drop it
+            # here and keep the pickled result off the pipe's hot path.
+            result.stdout = ""
+            result.stderr = ""
+        _results_q.put((suite, container, result))
+        count += 1
+    return count
+
+
+# Populated before the pool is created; fork-started workers inherit it
+# copy-on-write so submissions only need to carry index lists.
+_PREPARED: list[PreparedTest] = []
+
+
+def run_chunk_by_index(indices: list[int]) -> int:
+    """Run a chunk identified by indices into the fork-inherited _PREPARED."""
+    return run_prepared_chunk([_PREPARED[i] for i in indices])
+
+
+# Suite preparation runs on a thread pool, but the shared output directory
+# must be cleaned and populated by one suite at a time.
+_PREP_SETUP_LOCK = threading.Lock()
 
 
 def prepare_tests_from_yaml(
     yaml_path: Path,
     containers_dir: Path,
     work_dir: Path,
-    test_filter: str | None = None,
+    filter_re: re.Pattern | None = None,
 ) -> tuple[list[PreparedTest], str | None]:
     """
     Prepare all tests from a YAML file for execution.
     Returns (list of prepared tests, error message if any).
     """
-    with open(yaml_path) as f:
-        config = yaml.safe_load(f)
+    config = _load_yaml_cached(yaml_path)
 
     suite_name = config.get("name", yaml_path.stem)
     container_name = config.get("container", "")
@@ -744,43 +1117,50 @@ def prepare_tests_from_yaml(
     # Get global env setup
     global_env_setup = config.get("env_setup")
 
-    # Clean output directory before running suite
-    if "output_dir" in variables:
-        output_dir = Path(variables["output_dir"])
-        if output_dir.exists():
-            shutil.rmtree(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-    # Run setup script
-    setup = config.get("setup", {})
-    setup_script = setup.get("script", "")
-    if setup_script:
-        setup_script = substitute_variables(setup_script, variables)
-        try:
-            subprocess.run(
-                setup_script,
-                shell=True,
-                check=True,
-                cwd=work_dir,
-                capture_output=True,
-            )
-        except subprocess.CalledProcessError as e:
-            return [], f"Setup failed: {e.stderr.decode() if e.stderr else str(e)}"
+    # Clean the output directory and run the setup script under one lock:
+    # most suites share output_dir (test_output), so concurrent preparation
+    # threads would otherwise rmtree files a sibling is still creating.
+    # Only the health checks and container waits overlap across suites.
+    with _PREP_SETUP_LOCK:
+        if "output_dir" in variables:
+            output_dir = Path(variables["output_dir"])
+            if output_dir.exists():
+                shutil.rmtree(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+        setup = config.get("setup", {})
+        setup_script = setup.get("script", "")
+        if setup_script:
+            setup_script = substitute_variables(setup_script, variables)
+            try:
+                subprocess.run(
+                    setup_script,
+                    shell=True,
+                    check=True,
+                    cwd=work_dir,
+                    capture_output=True,
+                )
+            except subprocess.CalledProcessError as e:
+                return [], f"Setup failed: {e.stderr.decode() if e.stderr else str(e)}"
 
     # Container health check
-    health_result = _run_container_health_check(container_path, work_dir, variables)
+    health_result = _container_health_cached(container_path, work_dir, variables)
     if not health_result.passed:
         return [], f"Container health check failed: {health_result.message}"
 
     # Get and filter tests
     tests = config.get("tests", [])
-    if test_filter:
-        pattern = re.compile(test_filter, re.IGNORECASE)
-        tests = [t for t in tests if pattern.search(t.get("name", ""))]
+    if filter_re:
+        tests = [t for t in tests if filter_re.search(t.get("name", ""))]
 
-    # Create prepared tests
+    # Create prepared tests, pre-substituting variables where possible so
+    # the execution hot path doesn't repeat the work per test. Bind mounts
+    # depend only on the variables, so stat the parents once per suite.
+    binds = _compute_binds(work_dir, variables)
     prepared = []
     for test in tests:
+        command = test.get("command", "")
+        env_setup = test.get("env_setup", global_env_setup) or ""
         prepared.append(PreparedTest(
             suite_name=suite_name,
             container_name=container_name,
@@ -792,36 +1172,121 @@ def prepare_tests_from_yaml(
             default_timeout=default_timeout,
             script_runner=script_runner,
             script_ext=script_ext,
+            command_resolved=(
+                substitute_variables(command, variables) if command else None
+            ),
+            env_setup_resolved=(
+                substitute_variables(env_setup, variables) if env_setup else ""
+            ),
+            validations_resolved=_resolve_validations(
+                test.get("validate", []), variables
+            ),
+            binds=binds,
         ))
 
     return prepared, None
 
 
-def run_prepared_test_wrapper(args: tuple) -> tuple[str, str, TestResult]:
+# Shared-memory "running tests" display: each worker owns one fixed-size slot
+# and writes its current test name there. Readers scan the slots directly, so
+# no lock or proxy round-trip is needed for status updates.
+_RUNNING_SLOT_BYTES = 256
+
+# Slot index is thread-local so the same machinery serves both pool kinds:
+# process workers each have one thread, thread workers share the module.
+_worker_tls = threading.local()
+_running_shm: shared_memory.SharedMemory | None = None
+_results_q: Any = None
+_stop_barrier: Any = None
+
+
+def _init_worker(
+    shm_name: str,
+    slot_counter: Any,
+    results_q: Any,
+    capture_limit: int,
+    stop_barrier: Any,
+    keep_passing_output: bool,
+) -> None:
+    """Pool initializer: claim a slot index and attach the shared handles."""
+    global _running_shm, _results_q, _capture_limit, _stop_barrier
+    global _keep_passing_output
+    _capture_limit = capture_limit
+    _stop_barrier = stop_barrier
+    _keep_passing_output = keep_passing_output
+    with slot_counter.get_lock():
+        _worker_tls.slot = slot_counter.value
+        slot_counter.value += 1
+    if _running_shm is None:
+        _running_shm = shared_memory.SharedMemory(name=shm_name)
+    _results_q = results_q
+
+
+def _drain_worker_instances() -> None:
+    """Pool-wide shutdown task: stop this worker's warm instances.
+
+    Fork-started workers exit via os._exit, which never runs atexit, so
+    the parent submits one of these per worker before pool shutdown. The
+    barrier makes every worker take exactly one; if some workers are gone
+    the wait times out and the survivors still stop their own instances.
+    """
+    if _stop_barrier is not None:
+        try:
+            _stop_barrier.wait(timeout=5)
+        except Exception:
+            pass
+    _stop_instances()
+
+
+def _publish_running(test_key: str | None) -> None:
+    """Write (or clear) this worker's current test name in its shared slot."""
+    slot_idx = getattr(_worker_tls, "slot", -1)
+    if _running_shm is None or slot_idx < 0:
+        return
+    slot = bytearray(_RUNNING_SLOT_BYTES)
+    if test_key:
+        data = test_key.encode("utf-8", "replace")[: _RUNNING_SLOT_BYTES - 1]
+        slot[: len(data)] = data
+    start = slot_idx * _RUNNING_SLOT_BYTES
+    _running_shm.buf[start : start + _RUNNING_SLOT_BYTES] = slot
+
+
+def _read_running(shm: shared_memory.SharedMemory, n_slots: int) -> list[str]:
+    """Scan all worker slots and return the currently running test names."""
+    running = []
+    for i in range(n_slots):
+        raw = bytes(shm.buf[i * _RUNNING_SLOT_BYTES : (i + 1) * _RUNNING_SLOT_BYTES])
+        name = raw.split(b"\x00", 1)[0].decode("utf-8", "replace")
+        if name:
+            running.append(name)
+    return running
+
+
+def run_prepared_test_wrapper(prepared: PreparedTest) -> tuple[str, str, TestResult]:
     """Wrapper for running a single prepared test in parallel."""
-    prepared, running_tests = args
-
     test_name = prepared.test.get("name", "Unnamed test")
     test_key = f"{prepared.suite_name}: {test_name}"
 
     # Track running test
-    if running_tests is not None:
-        running_tests[test_key] = True
-
-    result = run_single_test(
-        test=prepared.test,
-        container_path=prepared.container_path,
-        variables=prepared.variables,
-        work_dir=prepared.work_dir,
-        global_env_setup=prepared.global_env_setup,
-        default_timeout=prepared.default_timeout,
-        script_runner=prepared.script_runner,
-        script_ext=prepared.script_ext,
-    )
+    _publish_running(test_key)
 
-    # Remove from running tests
-    if running_tests is not None:
-        running_tests.pop(test_key, None)
+    try:
+        result = run_single_test(
+            test=prepared.test,
+            container_path=prepared.container_path,
+            variables=prepared.variables,
+            work_dir=prepared.work_dir,
+            global_env_setup=prepared.global_env_setup,
+            default_timeout=prepared.default_timeout,
+            script_runner=prepared.script_runner,
+            script_ext=prepared.script_ext,
+            command_resolved=prepared.command_resolved,
+            env_setup_resolved=prepared.env_setup_resolved,
+            validations_resolved=prepared.validations_resolved,
+            binds=prepared.binds,
+        )
+    finally:
+        _publish_running(None)
 
     return prepared.suite_name, prepared.container_name, result
 
@@ -896,9 +1361,32 @@ def main():
         action="store_true",
         help="Disable JSONL streaming output",
     )
+    parser.add_argument(
+        "--jsonl-compact",
+        action="store_true",
+        help="Omit stdout/stderr of passing tests from JSONL records for "
+             "smaller files (the results-analysis workflow needs the full "
+             "records, so leave this off when feeding it)",
+    )
+    parser.add_argument(
+        "--max-output-bytes",
+        type=int,
+        default=_MAX_CAPTURE_BYTES,
+        help="Per-stream output capture cap in bytes; this much head and "
+             f"tail is kept per test (default: {_MAX_CAPTURE_BYTES})",
+    )
 
     args = parser.parse_args()
 
+    # Compile the test-name filter once; workers receive the compiled pattern
+    filter_re = re.compile(args.filter, re.IGNORECASE) if args.filter else None
+
+    # Apply the capture cap before any workers are created so forked pools
+    # inherit it; spawn-based pools pick it up through the initializer.
+    global _capture_limit, _keep_passing_output
+    _capture_limit = max(1024, args.max_output_bytes)
+    _keep_passing_output = not args.jsonl_compact
+
     base_dir = Path.cwd()
     tests_dir = base_dir / "tests"
     work_dir = base_dir / "work"
@@ -907,17 +1395,24 @@ def main():
     # Ensure work directory exists
     work_dir.mkdir(exist_ok=True)
 
-    # Find YAML files in tests/ directory
+    # Find YAML files in tests/ directory: read the directory once and
+    # match every pattern against that listing instead of re-globbing.
+    try:
+        with os.scandir(tests_dir) as it:
+            entries = sorted(e.name for e in it if e.is_file())
+    except OSError:
+        entries = []
+
     if args.yaml_files:
         yaml_files = []
         for pattern in args.yaml_files:
             # Check tests/ directory first
-            yaml_files.extend(tests_dir.glob(pattern))
-            # Also check if absolute/relative path was given
-            if Path(pattern).exists():
+            yaml_files.extend(tests_dir / n for n in fnmatch.filter(entries, pattern))
+            # Also check if an explicit path (outside tests/) was given
+            if "/" in pattern and Path(pattern).exists():
                 yaml_files.append(Path(pattern))
     else:
-        yaml_files = list(tests_dir.glob("*.yaml"))
+        yaml_files = [tests_dir / n for n in fnmatch.filter(entries, "*.yaml")]
 
     yaml_files = sorted(set(yaml_files))
 
@@ -942,25 +1437,52 @@ def main():
     all_results: list[TestSuiteResult] = []
     start_time = time.time()
 
-    # Open JSONL file for streaming results
+    # Read the previous run's durations before the JSONL file is truncated
+    # below; used to schedule longest tests first in parallel mode.
+    duration_history = _load_duration_history(args.jsonl)
+
+    # Stream JSONL records through a queue to one writer thread that batches
+    # file writes, so test-completion paths never block on I/O or a lock.
     jsonl_file = None
+    jsonl_q: queue.SimpleQueue | None = None
+    jsonl_writer = None
     if not args.no_jsonl:
-        jsonl_file = open(args.jsonl, "w")
+        jsonl_file = open(args.jsonl, "wb", buffering=1 << 20)
+        jsonl_q = queue.SimpleQueue()
 
-    # Lock for thread-safe JSONL writing
-    jsonl_lock = threading.Lock()
+        def jsonl_writer_loop():
+            batch: list[bytes] = []
+
+            def flush():
+                if batch:
+                    jsonl_file.write(b"".join(batch))
+                    jsonl_file.flush()
+                    batch.clear()
+
+            while True:
+                try:
+                    record = jsonl_q.get(timeout=0.05)
+                except queue.Empty:
+                    flush()
+                    continue
+                if record is None:  # shutdown sentinel
+                    flush()
+                    return
+                batch.append(orjson.dumps(record) + b"\n")
+                if len(batch) >= 64:
+                    flush()
+
+        jsonl_writer = threading.Thread(target=jsonl_writer_loop, daemon=True)
+        jsonl_writer.start()
 
     def write_jsonl_record(record: dict):
-        """Write a single record to JSONL file (thread-safe)."""
-        if jsonl_file is None:
-            return
-        with jsonl_lock:
-            jsonl_file.write(json.dumps(record) + "\n")
-            jsonl_file.flush()
+        """Queue a record for the JSONL writer thread."""
+        if jsonl_q is not None:
+            jsonl_q.put(record)
 
     def write_test_result_callback(suite_name: str, container: str, test: TestResult):
         """Callback for sequential mode to write results immediately."""
-        write_jsonl_record({
+        record = {
             "suite": suite_name,
             "container": container,
             "test": test.name,
@@ -969,9 +1491,12 @@ def main():
             "duration": test.duration,
             "message": test.message,
             "exit_code": test.exit_code,
-            "stdout": test.stdout,
-            "stderr": test.stderr,
-        })
+        }
+        # Keep green-run records small unless full output was requested
+        if not test.passed or _keep_passing_output:
+            record["stdout"] = test.stdout
+            record["stderr"] = test.stderr
+        write_jsonl_record(record)
 
     if args.jobs > 1:
         # Prepare all tests from all YAML files
@@ -979,43 +1504,122 @@ def main():
         all_prepared_tests: list[PreparedTest] = []
         suite_errors: dict[str, str] = {}
 
-        for yaml_path in yaml_files:
-            try:
-                prepared, error = prepare_tests_from_yaml(
-                    yaml_path, containers_dir, work_dir, args.filter
-                )
-                if error:
-                    suite_errors[yaml_path.stem] = error
-                else:
-                    all_prepared_tests.extend(prepared)
-            except Exception as e:
-                suite_errors[yaml_path.stem] = str(e)
-
-        # Shuffle tests to spread load across containers
-        random.shuffle(all_prepared_tests)
+        # Preparation is dominated by setup scripts and container health
+        # checks — subprocess waits that release the GIL — so overlap the
+        # suites with threads instead of running them back to back.
+        with ThreadPoolExecutor(max_workers=args.jobs) as prep_pool:
+            prep_futures = {
+                prep_pool.submit(
+                    prepare_tests_from_yaml,
+                    yaml_path, containers_dir, work_dir, filter_re,
+                ): yaml_path
+                for yaml_path in yaml_files
+            }
+            for future in as_completed(prep_futures):
+                yaml_path = prep_futures[future]
+                try:
+                    prepared, error = future.result()
+                    if error:
+                        suite_errors[yaml_path.stem] = error
+                    else:
+                        all_prepared_tests.extend(prepared)
+                except Exception as e:
+                    suite_errors[yaml_path.stem] = str(e)
+
+        # Dispatch longest tests first (LPT scheduling): with skewed
+        # neuroimaging durations this keeps a slow outlier from landing on
+        # an otherwise drained pool at the end of the run. Estimates come
+        # from the previous run's JSONL; unknown tests fall back to their
+        # timeout so they sort conservatively early.
+        def estimated_cost(prepared: PreparedTest) -> float:
+            key = (prepared.suite_name, prepared.test.get("name", "Unnamed test"))
+            known = duration_history.get(key)
+            if known is not None:
+                return known
+            return float(prepared.test.get("timeout", prepared.default_timeout))
+
+        all_prepared_tests.sort(key=estimated_cost, reverse=True)
         total_tests = len(all_prepared_tests)
 
-        console.print(f"[dim]Prepared {total_tests} tests from {len(yaml_files)} suites (shuffled)[/]")
+        # Group tests into small per-container chunks: fields shared by the
+        # tests of a suite (variables, env setup, container path) are then
+        # pickled once per chunk instead of once per test. Chunks are kept
+        # small, and ordered longest-first, so load balancing survives.
+        chunk_size = 4
+        index_chunks: list[list[int]] = []
+        open_chunks: dict[str, list[int]] = {}
+        for idx, prepared in enumerate(all_prepared_tests):
+            group = open_chunks.setdefault(prepared.container_name, [])
+            group.append(idx)
+            if len(group) >= chunk_size:
+                index_chunks.append(group)
+                open_chunks[prepared.container_name] = []
+        index_chunks.extend(g for g in open_chunks.values() if g)
+        index_chunks.sort(
+            key=lambda c: sum(estimated_cost(all_prepared_tests[i]) for i in c),
+            reverse=True,
+        )
+
+        # Small runs never earn back a process pool's startup cost, and the
+        # tests are subprocess-bound (apptainer does the work), so threads
+        # parallelize them just as well with zero spawn or pickling cost.
+        use_threads = total_tests <= 12
+
+        # Fork workers where available: prepared tests are then inherited
+        # copy-on-write and each submission carries only a list of ints.
+        # Platforms without fork fall back to pickling the chunk itself.
+        use_fork = "fork" in multiprocessing.get_all_start_methods()
+        mp_context = multiprocessing.get_context("fork") if use_fork else None
+        if use_fork or use_threads:
+            global _PREPARED
+            _PREPARED = all_prepared_tests
+
+        # Clamp worker count: spawning a full pool for a handful of tests
+        # costs more in startup/IPC than it saves. Apptainer startup
+        # dominates per test, so a grain of ~2 tests per worker is enough;
+        # cap at 32 to avoid oversubscription on large hosts.
+        grain = 2
+        effective_jobs = max(1, min(args.jobs, 32, (total_tests + grain - 1) // grain))
+
+        console.print(f"[dim]Prepared {total_tests} tests from {len(yaml_files)} suites (longest first)[/]")
 
         # Report any suite errors
         for suite_name, error in suite_errors.items():
             console.print(f"[red]✗[/] {suite_name}: {error}")
 
-        # Parallel execution
-        manager = Manager()
-        running_tests = manager.dict()
-        test_counts = manager.dict()
-        test_counts["passed"] = 0
-        test_counts["failed"] = 0
-        test_counts["completed"] = 0
+        # Parallel execution. Worker "currently running" names live in a
+        # shared-memory block (one slot per worker) read directly by the
+        # progress thread — no Manager proxy RPC on the per-test path.
+        running_shm = shared_memory.SharedMemory(
+            create=True, size=effective_jobs * _RUNNING_SLOT_BYTES
+        )
+        running_shm.buf[:] = b"\x00" * (effective_jobs * _RUNNING_SLOT_BYTES)
+        slot_counter = (mp_context or multiprocessing).Value("i", 0)
+
+        # One queue streams per-test results straight from the workers, so
+        # the parent sees tests as they finish even though chunks are the
+        # submit granularity; futures only carry counts and exceptions.
+        if use_threads:
+            results_q: Any = queue.Queue(maxsize=effective_jobs * 4)
+            stop_barrier: Any = threading.Barrier(effective_jobs)
+        else:
+            results_q = (mp_context or multiprocessing).Queue(maxsize=effective_jobs * 4)
+            stop_barrier = (mp_context or multiprocessing).Barrier(effective_jobs)
 
-        # Collect results by suite for aggregation
-        suite_results: dict[str, list[TestResult]] = {}
-        suite_containers: dict[str, str] = {}
-        results_lock = threading.Lock()
+        # Counters live in the parent only (written by the as_completed loop,
+        # read by the progress thread), so a plain dict and lock suffice.
+        test_counts = {"passed": 0, "failed": 0, "completed": 0}
+        counts_lock = threading.Lock()
 
-        # Background thread to update progress with running tests
+        # Per-suite running totals, updated as each result arrives so no
+        # second pass over the full result list is needed afterwards. Only
+        # the main thread's result loop touches these — no lock needed.
+        suite_agg: dict[str, dict[str, Any]] = {}
+
+        # Background thread to update progress with running tests; completions
+        # wake it immediately instead of waiting for the next poll tick
         progress_stop_event = threading.Event()
+        progress_dirty = threading.Event()
 
         with Progress(
             SpinnerColumn(),
@@ -1024,21 +1628,24 @@ def main():
             TextColumn("[green]{task.fields[passed]}[/] passed | [red]{task.fields[failed]}[/] failed | {task.completed}/{task.total}"),
             TimeElapsedColumn(),
             console=console,
-            refresh_per_second=4,
+            refresh_per_second=2,
         ) as progress:
             task = progress.add_task("Running tests...", total=total_tests, passed=0, failed=0)
 
             def update_running_description():
                 """Update progress description with currently running tests."""
                 while not progress_stop_event.is_set():
+                    # Wake on completion events; fall back to a 2 Hz tick so
+                    # the running-test names stay fresh during long tests
+                    progress_dirty.wait(timeout=0.5)
+                    progress_dirty.clear()
                     try:
-                        # Update counts from shared dict
-                        passed = test_counts["passed"]
-                        failed = test_counts["failed"]
-                        completed = test_counts["completed"]
-                        progress.update(task, completed=completed, passed=passed, failed=failed)
+                        with counts_lock:
+                            passed = test_counts["passed"]
+                            failed = test_counts["failed"]
+                            completed = test_counts["completed"]
 
-                        running = list(running_tests.keys())
+                        running = _read_running(running_shm, effective_jobs)
                         if running:
                             # Show up to 3 running tests
                             display = running[:3]
@@ -1048,78 +1655,210 @@ def main():
                                 desc = f"Running: {', '.join(display)}"
                         else:
                             desc = "Running tests..."
-                        progress.update(task, description=desc)
+
+                        # One combined update per tick keeps Rich to a
+                        # single layout/diff pass
+                        progress.update(
+                            task,
+                            completed=completed,
+                            passed=passed,
+                            failed=failed,
+                            description=desc,
+                        )
                     except Exception:
                         pass
-                    time.sleep(0.25)
 
             desc_thread = threading.Thread(target=update_running_description, daemon=True)
             desc_thread.start()
 
-            with ProcessPoolExecutor(max_workers=args.jobs) as executor:
-                futures = {
-                    executor.submit(
-                        run_prepared_test_wrapper,
-                        (prepared, running_tests),
-                    ): prepared
-                    for prepared in all_prepared_tests
-                }
+            # Per-test lines are buffered and printed in batches so Rich does
+            # not re-render the live display for every single result.
+            print_buf: list[str] = []
+            last_print_flush = time.monotonic()
 
-                for future in as_completed(futures):
-                    suite_name, container_name, result = future.result()
+            def _flush_prints():
+                nonlocal last_print_flush
+                if print_buf:
+                    progress.console.print("\n".join(print_buf))
+                    print_buf.clear()
+                last_print_flush = time.monotonic()
 
-                    # Update counts
-                    test_counts["completed"] = test_counts["completed"] + 1
+            show_each = not args.quiet
+
+            def _handle_result(suite_name: str, container_name: str, result: TestResult):
+                # Update counts
+                with counts_lock:
+                    test_counts["completed"] += 1
                     if result.passed:
-                        test_counts["passed"] = test_counts["passed"] + 1
+                        test_counts["passed"] += 1
                     else:
-                        test_counts["failed"] = test_counts["failed"] + 1
-
-                    # Store result for suite aggregation
-                    with results_lock:
-                        if suite_name not in suite_results:
-                            suite_results[suite_name] = []
-                            suite_containers[suite_name] = container_name
-                        suite_results[suite_name].append(result)
-
-                    # Write to JSONL
-                    write_jsonl_record({
-                        "suite": suite_name,
+                        test_counts["failed"] += 1
+                progress_dirty.set()
+
+                # Store result for suite aggregation
+                agg = suite_agg.get(suite_name)
+                if agg is None:
+                    agg = suite_agg[suite_name] = {
                         "container": container_name,
-                        "test": result.name,
-                        "passed": result.passed,
-                        "start_time": result.start_time,
-                        "duration": result.duration,
-                        "message": result.message,
-                        "exit_code": result.exit_code,
-                        "stdout": result.stdout,
-                        "stderr": result.stderr,
-                    })
-
-                    # Show individual test result if not quiet
-                    if not args.quiet:
-                        test_status = "[green]PASS[/]" if result.passed else "[red]FAIL[/]"
-                        progress.console.print(f"  {test_status} {suite_name}: {result.name} ({result.duration:.2f}s)")
-                        if not result.passed:
-                            progress.console.print(f"    [dim]{result.message}[/]")
+                        "passed": 0,
+                        "failed": 0,
+                        "duration": 0.0,
+                        "results": [],
+                    }
+                if result.passed:
+                    agg["passed"] += 1
+                else:
+                    agg["failed"] += 1
+                agg["duration"] += result.duration
+                agg["results"].append(result)
+
+                # Write to JSONL; output is only included for failures
+                record = {
+                    "suite": suite_name,
+                    "container": container_name,
+                    "test": result.name,
+                    "passed": result.passed,
+                    "start_time": result.start_time,
+                    "duration": result.duration,
+                    "message": result.message,
+                    "exit_code": result.exit_code,
+                }
+                if not result.passed or _keep_passing_output:
+                    record["stdout"] = result.stdout
+                    record["stderr"] = result.stderr
+                write_jsonl_record(record)
+
+                # Show individual test result if not quiet
+                if show_each:
+                    test_status = _PASS_TAG if result.passed else _FAIL_TAG
+                    print_buf.append(f"  {test_status} {suite_name}: {result.name} ({result.duration:.2f}s)")
+                    if not result.passed:
+                        print_buf.append(f"    [dim]{result.message}[/]")
+                    if len(print_buf) >= 16 or time.monotonic() - last_print_flush > 0.1:
+                        _flush_prints()
+
+            # Chunks are submitted to a shared call queue that idle workers
+            # pull from, so a worker stuck on a long neuroimaging test never
+            # blocks the others from draining the remaining work — the same
+            # balancing a per-worker steal-from-neighbor scheme would give,
+            # without the machinery.
+            if use_threads:
+                pool = ThreadPoolExecutor(
+                    max_workers=effective_jobs,
+                    initializer=_init_worker,
+                    initargs=(
+                        running_shm.name,
+                        slot_counter,
+                        results_q,
+                        _capture_limit,
+                        stop_barrier,
+                        _keep_passing_output,
+                    ),
+                )
+            else:
+                pool = ProcessPoolExecutor(
+                    max_workers=effective_jobs,
+                    mp_context=mp_context,
+                    initializer=_init_worker,
+                    initargs=(
+                        running_shm.name,
+                        slot_counter,
+                        results_q,
+                        _capture_limit,
+                        stop_barrier,
+                        _keep_passing_output,
+                    ),
+                )
+            with pool as executor:
+                if use_fork or use_threads:
+                    futures = {
+                        executor.submit(run_chunk_by_index, indices): indices
+                        for indices in index_chunks
+                    }
+                else:
+                    futures = {
+                        executor.submit(
+                            run_prepared_chunk,
+                            [all_prepared_tests[i] for i in indices],
+                        ): indices
+                        for indices in index_chunks
+                    }
+
+                pending = set(futures)
+                expected = None  # exact once every chunk has reported
+                collected = 0
+                if not pending:
+                    # Nothing was submitted (filter matched no tests, or
+                    # every suite failed preparation) — don't wait forever.
+                    expected = 0
+                while expected is None or collected < expected:
+                    try:
+                        item = results_q.get(timeout=0.25)
+                    except queue.Empty:
+                        item = None
+                        # Idle tick: show whatever lines are buffered so
+                        # finished tests aren't hidden behind a slow one
+                        _flush_prints()
+                    if item is not None:
+                        _handle_result(*item)
+                        collected += 1
+                    if pending:
+                        done = {f for f in pending if f.done()}
+                        if done:
+                            pending -= done
+                            for f in done:
+                                exc = f.exception()
+                                if exc is not None:
+                                    progress.console.print(
+                                        f"[red]Worker chunk failed: {exc}[/]"
+                                    )
+                        if not pending:
+                            expected = sum(
+                                f.result() for f in futures if f.exception() is None
+                            )
+
+                # A crashed chunk may have streamed results beyond its
+                # reported count; drain whatever is left without blocking.
+                while True:
+                    try:
+                        _handle_result(*results_q.get_nowait())
+                    except queue.Empty:
+                        break
+                _flush_prints()
+
+                # Stop every worker's warm apptainer instances before the
+                # pool shuts down; see _drain_worker_instances.
+                try:
+                    stop_futures = [
+                        executor.submit(_drain_worker_instances)
+                        for _ in range(effective_jobs)
+                    ]
+                    for f in stop_futures:
+                        try:
+                            f.result(timeout=30)
+                        except Exception:
+                            pass
+                except Exception:
+                    # A broken pool can't run shutdown tasks; nothing to do.
+                    pass
 
             # Stop background threads
             progress_stop_event.set()
             desc_thread.join(timeout=1.0)
 
-        # Aggregate results into TestSuiteResult objects
-        for suite_name, results in suite_results.items():
-            passed = sum(1 for r in results if r.passed)
-            failed = sum(1 for r in results if not r.passed)
-            duration = sum(r.duration for r in results)
+        running_shm.close()
+        running_shm.unlink()
+
+        # Materialize the incrementally maintained totals
+        for suite_name, agg in suite_agg.items():
             all_results.append(TestSuiteResult(
                 name=suite_name,
-                container=suite_containers[suite_name],
-                total=len(results),
-                passed=passed,
-                failed=failed,
-                duration=duration,
-                results=results,
+                container=agg["container"],
+                total=len(agg["results"]),
+                passed=agg["passed"],
+                failed=agg["failed"],
+                duration=agg["duration"],
+                results=agg["results"],
             ))
 
         # Add error results for suites that failed to prepare
@@ -1144,17 +1883,19 @@ def main():
                 yaml_path,
                 containers_dir,
                 work_dir,
-                args.filter,
+                filter_re,
                 verbose=not args.quiet,
                 on_test_complete=write_test_result_callback,
             )
             all_results.append(result)
 
-            status = "[green]PASS[/]" if result.failed == 0 else "[red]FAIL[/]"
+            status = _PASS_TAG if result.failed == 0 else _FAIL_TAG
             console.print(f"  {status} {result.passed}/{result.total} tests passed ({result.duration:.1f}s)")
 
-    # Close JSONL file
+    # Drain and close the JSONL writer
     if jsonl_file is not None:
+        jsonl_q.put(None)
+        jsonl_writer.join(timeout=5.0)
         jsonl_file.close()
         console.print(f"[dim]Streaming results written to {args.jsonl}[/]")
 
@@ -1163,11 +1904,22 @@ def main():
     # Summary
     console.print("\n")
 
-    total_tests = sum(r.total for r in all_results)
-    total_passed = sum(r.passed for r in all_results)
-    total_failed = sum(r.failed for r in all_results)
-    suites_passed = sum(1 for r in all_results if r.failed == 0)
-    suites_failed = sum(1 for r in all_results if r.failed > 0)
+    # One pass over the results covers every summary figure
+    total_tests = total_passed = total_failed = 0
+    suites_passed = suites_failed = 0
+    for r in all_results:
+        total_tests += r.total
+        total_passed += r.passed
+        total_failed += r.failed
+        if r.failed == 0:
+            suites_passed += 1
+        else:
+            suites_failed += 1
+
+    sorted_results = sorted(all_results, key=lambda r: (-r.failed, r.name))
+    failed_tests = [
+        (r, t) for r in all_results for t in r.results if not t.passed
+    ]
 
     # Results table
     table = Table(title="Test Results Summary", box=box.ROUNDED)
@@ -1178,11 +1930,13 @@ def main():
     table.add_column("Time", justify="right")
     table.add_column("Status")
 
-    for result in sorted(all_results, key=lambda r: (-r.failed, r.name)):
-        if args.failed_only and result.failed == 0:
-            continue
-
-        status = "[green]PASS[/]" if result.failed == 0 else "[red]FAIL[/]"
+    display_results = (
+        [r for r in sorted_results if r.failed > 0]
+        if args.failed_only
+        else sorted_results
+    )
+    for result in display_results:
+        status = _PASS_TAG if result.failed == 0 else _FAIL_TAG
         table.add_row(
             result.name,
             str(result.passed),
@@ -1195,13 +1949,11 @@ def main():
     console.print(table)
 
     # Show failed tests details
-    if total_failed > 0:
+    if failed_tests:
         console.print("\n[bold red]Failed Tests:[/]")
-        for result in all_results:
-            for test in result.results:
-                if not test.passed:
-                    console.print(f"  [red]✗[/] {result.name} > {test.name}")
-                    console.print(f"    [dim]{test.message}[/]")
+        for result, test in failed_tests:
+            console.print(f"  [red]✗[/] {result.name} > {test.name}")
+            console.print(f"    [dim]{test.message}[/]")
 
     # Final summary
     console.print(Panel(
@@ -1216,66 +1968,73 @@ def main():
 
     # Write JSON output if requested
     if args.output:
-        from datetime import datetime
-
-        output_data = {
-            "summary": {
-                "total_suites": len(all_results),
-                "suites_passed": suites_passed,
-                "suites_failed": suites_failed,
-                "total_tests": total_tests,
-                "tests_passed": total_passed,
-                "tests_failed": total_failed,
-                "duration": total_duration,
-                "run_timestamp": datetime.now().isoformat(),
-            },
-            "suites": [
-                {
-                    "name": r.name,
-                    "container": r.container,
-                    "total": r.total,
-                    "passed": r.passed,
-                    "failed": r.failed,
-                    "duration": r.duration,
-                    "tests": [
-                        {
-                            "name": t.name,
-                            "passed": t.passed,
-                            "start_time": t.start_time,
-                            "duration": t.duration,
-                            "message": t.message,
-                        }
-                        for t in r.results
-                    ],
-                }
-                for r in all_results
-            ],
+        summary = {
+            "total_suites": len(all_results),
+            "suites_passed": suites_passed,
+            "suites_failed": suites_failed,
+            "total_tests": total_tests,
+            "tests_passed": total_passed,
+            "tests_failed": total_failed,
+            "duration": total_duration,
+            "run_timestamp": datetime.now(),  # orjson encodes natively
         }
 
-        with open(args.output, "w") as f:
-            json.dump(output_data, f, indent=2)
+        # Stream one suite at a time instead of materialising the whole
+        # report (including every captured message) as a single object.
+        with open(args.output, "wb", buffering=1 << 20) as f:
+            f.write(b'{"summary": ')
+            f.write(orjson.dumps(summary))
+            f.write(b', "suites": [')
+            for i, r in enumerate(all_results):
+                if i:
+                    f.write(b", ")
+                f.write(
+                    orjson.dumps(
+                        {
+                            "name": r.name,
+                            "container": r.container,
+                            "total": r.total,
+                            "passed": r.passed,
+                            "failed": r.failed,
+                            "duration": r.duration,
+                            "tests": [
+                                {
+                                    "name": t.name,
+                                    "passed": t.passed,
+                                    "start_time": t.start_time,
+                                    "duration": t.duration,
+                                    "message": t.message,
+                                }
+                                for t in r.results
+                            ],
+                        }
+                    )
+                )
+            f.write(b"]}")
 
         console.print(f"\n[dim]Results written to {args.output}[/]")
 
     # Write log file
     if not args.no_log:
-        from datetime import datetime
-
-        with open(args.log, "w") as f:
-            f.write(f"# Neurocontainer Test Results\n")
-            f.write(f"# Generated: {datetime.now().isoformat()}\n")
-            f.write(f"# Total Duration: {total_duration:.2f}s\n")
-            f.write(f"#\n")
-            f.write(f"# Format: STATE | START_TIME | DURATION | SUITE | TEST_NAME | MESSAGE\n")
-            f.write(f"#\n\n")
-
-            for suite_result in sorted(all_results, key=lambda r: r.name):
-                for test in suite_result.results:
-                    state = "PASS" if test.passed else "FAIL"
-                    f.write(
-                        f"{state} | {test.start_time} | {test.duration:.3f}s | "
-                        f"{suite_result.name} | {test.name} | {test.message}\n"
-                    )
+        lines = [
+            f"# Neurocontainer Test Results\n",
+            f"# Generated: {datetime.now().isoformat()}\n",
+            f"# Total Duration: {total_duration:.2f}s\n",
+            f"#\n",
+            f"# Format: STATE | START_TIME | DURATION | SUITE | TEST_NAME | MESSAGE\n",
+            f"#\n\n",
+        ]
+        for suite_result in sorted(all_results, key=lambda r: r.name):
+            for test in suite_result.results:
+                state = "PASS" if test.passed else "FAIL"
+                lines.append(
+                    f"{state} | {test.start_time} | {test.duration:.3f}s | "
+                    f"{suite_result.name} | {test.name} | {test.message}\n"
+                )
+
+        # Preformat every line, then hand the batch to one buffered writer
+        with open(args.log, "w", buffering=1 << 20) as f:
+            f.writelines(lines)
 
         console.print(f"[dim]Log written to {args.log}[/]")
 